@@ -1,13 +1,394 @@
 """
 @author: Afroz Alam (github.com/afrozalm)
 """
+from array import array
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True)
+def _setLabel(v, label, phase, indptr, indices_n, indices_w, LABEL, phase_of,
+              outer_pha, outer_list, outer_n, oe_v, oe_n, oe_w, oe_tail):
+    """
+    Updates the LABEL array, stamping the entry with the current phase, and
+    if the new label is an outer label marks v outer for this phase, pushes
+    it onto the outer-vertex stack and pushes its incident edges
+    (v, n_vw, w) onto the outer-edge queue
+
+    Args:
+        v (int):        a vertex in [1, V]
+        label (int):    a label in {-n_vw, -1, 0..V+2W}
+        phase (int):    the current search phase
+        outer_n (int):  current size of the outer-vertex stack
+        oe_tail (int):  current tail of the outer-edge queue
+    Returns:
+        (int,int): the updated outer-vertex stack size and outer-edge tail
+    """
+    LABEL[v] = label
+    phase_of[v] = phase
+
+    if label >= 0 and outer_pha[v] != phase:
+        outer_pha[v] = phase
+        outer_list[outer_n] = v
+        outer_n += 1
+        for k in range(indptr[v], indptr[v+1]):
+            oe_v[oe_tail] = v
+            oe_n[oe_tail] = indices_n[k]
+            oe_w[oe_tail] = indices_w[k]
+            oe_tail += 1
+    return outer_n, oe_tail
+
+
+@njit(cache=True)
+def _L(x, y, n_xy, phase, V, indptr, indices_n, indices_w, LABEL, phase_of,
+       MATE, FIRST, outer_pha, outer_list, outer_n, oe_v, oe_n, oe_w,
+       oe_tail):
+    """
+    L assigns the edge label n(xy) to nonouter vertices. Edge xy joins
+    outer vertices x,y. L sets join to the first nonouter vertex n both
+    P(x) and P(y). Then it labels all nonouter vertices preceding join in
+    P(x) or P(y)
+
+    Args:
+        x (int): vertex x in [1, V]
+        y (int): vertex y in [1, V]
+        n_xy (int): edge number for edge xy
+    Returns:
+        (int,int): the updated outer-vertex stack size and outer-edge tail
+    """
+    r, s = FIRST[x], FIRST[y]
+    if r == s:
+        return outer_n, oe_tail
+
+    # steps L1-L2 find join by advancing alternately along paths P(x) and
+    # P(y). Flags are assigned to nonouter vertices r in these paths. This
+    # is done by setting LABEL(r) to a negative edge number,
+    #       LABEL(r) <- -n(xy).
+    # This way, each invocation of L uses a distinct flag value
+    # Both r and s are flagged so that whichever path the scan advances
+    # along, it stops at the first vertex common to P(x) and P(y)
+
+    outer_n, oe_tail = _setLabel(r, -n_xy, phase, indptr, indices_n,
+                                 indices_w, LABEL, phase_of, outer_pha,
+                                 outer_list, outer_n, oe_v, oe_n, oe_w,
+                                 oe_tail)
+    outer_n, oe_tail = _setLabel(s, -n_xy, phase, indptr, indices_n,
+                                 indices_w, LABEL, phase_of, outer_pha,
+                                 outer_list, outer_n, oe_v, oe_n, oe_w,
+                                 oe_tail)
+
+    # L1: switch paths
+    while True:
+        # r is flagged nonouter vertex, alternately in P(x) and P(y);
+        # the interchange "if s != 0: r, s = s, r" is run branchlessly as a
+        # masked XOR swap so the alternation does not cost a mispredicted
+        # branch per iteration
+        m = -np.int32(s != 0)
+        t = (r ^ s) & m
+        r = r ^ t
+        s = s ^ t
+
+        # L2: next nonouter vertex
+        # r is set to the next nonouter vertex in P(x) or P(y)
+        r = FIRST[LABEL[MATE[r]]]
+        # a flag only counts if it was written in this phase; stale labels
+        # from earlier phases are never cleared, only outdated
+        if phase_of[r] == phase and LABEL[r] == -n_xy:
+            join = r
+            break
+        outer_n, oe_tail = _setLabel(r, -n_xy, phase, indptr, indices_n,
+                                     indices_w, LABEL, phase_of, outer_pha,
+                                     outer_list, outer_n, oe_v, oe_n, oe_w,
+                                     oe_tail)
+        # go to L1
+
+    # L3: label vertices in P(x), P(y)
+    for v in (FIRST[x], FIRST[y]):
+        # L4: label v
+        while v != join:
+            outer_n, oe_tail = _setLabel(v, n_xy, phase, indptr, indices_n,
+                                         indices_w, LABEL, phase_of,
+                                         outer_pha, outer_list, outer_n,
+                                         oe_v, oe_n, oe_w, oe_tail)
+            FIRST[v] = join
+            v = FIRST[LABEL[MATE[v]]]
+    # L5: update FIRST
+    # only vertices on the outer-vertex stack can be outer, so the scan is
+    # over outer_list instead of all of [1, V]
+    for k in range(outer_n):
+        i = outer_list[k]
+        if outer_pha[FIRST[i]] == phase:
+            FIRST[i] = join
+    return outer_n, oe_tail
+
+
+@njit(cache=True)
+def _R(v, w, V, END, LABEL, MATE):
+    """
+    R(v,w) rematches edges in the augmenting path. Vertex v is outer.
+    Part of path (w)*P(v) is in the augmenting path. It gets rematched
+    by R(v, w) (Although R sets MATE(v) <- w, it does not set
+    MATE(w) <- v. This is done in step E3 or another call to R)
+
+    The recursion of the paper is run as an explicit LIFO stack of (v, w)
+    pairs: each R call rematches one vertex of the augmenting path, so the
+    pending calls never exceed twice the path length
+
+    Args:
+        v (int): vertex in [1, V]
+        w (int): vertex in [1, V]
+    Returns:
+        None
+    """
+    stack_v = np.empty(2 * (V + 1), dtype=np.int32)
+    stack_w = np.empty(2 * (V + 1), dtype=np.int32)
+    stack_v[0] = v
+    stack_w[0] = w
+    sp = 1
+
+    while sp > 0:
+        sp -= 1
+        v, w = stack_v[sp], stack_w[sp]
+
+        # R1: Match v to w
+        t = MATE[v]
+        MATE[v] = w
+        if MATE[t] != v:
+            # the path is completely rematched
+            continue
+
+        # R2: Rematch a path
+        lab = LABEL[v]
+        if lab >= 1 and lab <= V:
+            # v has a vertex label
+            MATE[t] = lab
+            stack_v[sp] = lab
+            stack_w[sp] = t
+            sp += 1
+            continue
+
+        # R3: Rematch two paths; (x, y) is pushed last so that it is
+        # rematched first, as in the recursive formulation
+        n = lab - (V + 1)
+        x, y = END[n], END[n+1]
+        stack_v[sp] = y
+        stack_w[sp] = x
+        sp += 1
+        stack_v[sp] = x
+        stack_w[sp] = y
+        sp += 1
+
+
+@njit(cache=True)
+def _searchRoot(u, phase, V, indptr, indices_n, indices_w, END, LABEL,
+                phase_of, MATE, FIRST, outer_pha, outer_list, oe_v, oe_n,
+                oe_w):
+    """
+    Runs one search phase (steps E1-E6) for the unmatched root u, augmenting
+    MATE if an augmenting path is found. The caller owns the scratch arrays
+    and bumps the phase afterwards (E7)
+
+    Args:
+        u (int):     an unmatched vertex in [1, V]
+        phase (int): the current search phase
+    Returns:
+        bool: True if the matching was augmented, False otherwise
+    """
+    outer_n = 0
+    oe_head = 0
+    oe_tail = 0
+    outer_n, oe_tail = _setLabel(u, 0, phase, indptr, indices_n,
+                                 indices_w, LABEL, phase_of, outer_pha,
+                                 outer_list, outer_n, oe_v, oe_n, oe_w,
+                                 oe_tail)
+    FIRST[u] = 0
+
+    # E2: Choose an edge
+    while True:
+        if oe_head >= oe_tail:
+            return False
+        x, n_xy = oe_v[oe_head], oe_n[oe_head]
+        y = oe_w[oe_head]
+        oe_head += 1
+
+        # E3: augment the matching
+        if MATE[y] == 0 and y != u:
+            MATE[y] = x
+            # R completes augmenting path along path (y)*P(x)
+            _R(x, y, V, END, LABEL, MATE)
+            return True
+
+        # E4: assign edge labels
+        if outer_pha[y] == phase:
+            if FIRST[x] == FIRST[y]:
+                # x and y already lie in the same blossom, so L has
+                # nothing to label; prune the call here
+                continue
+            # L assigns edge label n(xy) to nonouter vertices in
+            #  P(x) and P(y)
+            outer_n, oe_tail = _L(x, y, n_xy, phase, V, indptr,
+                                  indices_n, indices_w, LABEL, phase_of,
+                                  MATE, FIRST, outer_pha, outer_list,
+                                  outer_n, oe_v, oe_n, oe_w, oe_tail)
+            continue
+
+        # E5: Assign a  vertex label
+        v = MATE[y]
+        if outer_pha[v] != phase:
+            outer_n, oe_tail = _setLabel(v, x, phase, indptr, indices_n,
+                                         indices_w, LABEL, phase_of,
+                                         outer_pha, outer_list, outer_n,
+                                         oe_v, oe_n, oe_w, oe_tail)
+            FIRST[v] = y
+
+        # E6: get next edge (continue looping)
+
+
+@njit(cache=True)
+def _E(V, indptr, indices_n, indices_w, END, LABEL, MATE, FIRST, oe_v, oe_n,
+       oe_w):
+    """
+    E constructs a maximum matching on a graph. It starts a search for an
+    augmenting path to each unmatched vertex u. It scans edges of the
+    graph, deciding to assign new labels or to augment the matching
+
+    Args:
+        V (int): number of nodes in graph
+    Returns:
+        None
+    """
+    VPlusOne = V + 1
+
+    # labels and outer marks are phase-stamped: an entry is only valid if
+    # its stamp equals the current phase, so E7 invalidates all of them by
+    # bumping the phase instead of clearing arrays. outer_list is a stack
+    # of the vertices marked outer this phase; the preallocated
+    # oe_v/oe_n/oe_w hold the queued outer edges (v, n_vw, w) between head
+    # and tail, consumed in FIFO order to run E2:
+    #   "A possible choice method is "breadth-first": an outer vertex
+    #    x = x1 is chosen, and edges x1y are chosen in succeeding
+    #    executions of E2, when all such edges have been chosen, the
+    #    vertex x2 that was labeled immediately after x1 is chosen, and
+    #    the process is repeated for x = x2. This breadth-first method
+    #    requires that Algorithm E maintain a list of outer vertices,
+    #    x1, x2, ..."
+    phase = 1
+    phase_of = np.zeros(VPlusOne, dtype=np.int32)
+    outer_pha = np.zeros(VPlusOne, dtype=np.int32)
+    outer_list = np.empty(VPlusOne, dtype=np.int32)
+    outer_n = 0
+    oe_head = 0
+    oe_tail = 0
+
+    # only vertices unmatched on entry can ever be roots (augmenting keeps
+    # matched vertices matched), and once the matching is perfect or near
+    # perfect no further search can succeed
+    matched = np.count_nonzero(MATE[1:] > 0)
+    roots = np.nonzero(MATE[1:] == 0)[0] + 1
+
+    for i in range(roots.shape[0]):
+        if matched >= V - 1:
+            # the matching is maximum, remaining searches are no-ops
+            return
+        u = roots[i]
+        # E1: Find an unmatched vertex
+        if MATE[u] > 0:
+            continue
+        if _searchRoot(u, phase, V, indptr, indices_n, indices_w, END,
+                       LABEL, phase_of, MATE, FIRST, outer_pha, outer_list,
+                       oe_v, oe_n, oe_w):
+            matched += 2
+        # E7: bumping the phase outdates every label and outer mark
+        phase += 1
+
+
+@njit(parallel=True, cache=True)
+def _parallelPhase(V, indptr, indices_n, indices_w, END, MATE, roots):
+    """
+    Searches from every root concurrently, each thread against its own copy
+    of MATE with thread-local scratch arrays. The candidate matchings are
+    returned for a serial commit pass; nothing shared is mutated
+
+    Args:
+        V (int):         number of nodes in graph
+        roots (ndarray): the unmatched vertices to search from
+    Returns:
+        (ndarray,ndarray):  a success flag per root and the (roots, V+1)
+                            array of candidate MATE rows
+    """
+    numRoots = roots.shape[0]
+    cap = indices_n.shape[0]
+    success = np.zeros(numRoots, dtype=np.uint8)
+    candMate = np.empty((numRoots, V + 1), dtype=np.int32)
+
+    for i in prange(numRoots):
+        localMate = MATE.copy()
+        LABEL = np.full(V + 1, -1, dtype=np.int32)
+        FIRST = np.zeros(V + 1, dtype=np.int32)
+        phase_of = np.zeros(V + 1, dtype=np.int32)
+        outer_pha = np.zeros(V + 1, dtype=np.int32)
+        outer_list = np.empty(V + 1, dtype=np.int32)
+        oe_v = np.empty(cap, dtype=np.int32)
+        oe_n = np.empty(cap, dtype=np.int32)
+        oe_w = np.empty(cap, dtype=np.int32)
+        if _searchRoot(roots[i], 1, V, indptr, indices_n, indices_w, END,
+                       LABEL, phase_of, localMate, FIRST, outer_pha,
+                       outer_list, oe_v, oe_n, oe_w):
+            success[i] = 1
+            candMate[i] = localMate
+    return success, candMate
+
+
+@njit(cache=True)
+def _commitPhase(V, MATE, snap, success, candMate):
+    """
+    Serially applies the candidate augmentations found by _parallelPhase.
+    A candidate is committed only if every vertex it rematches still holds
+    its snapshot mate, i.e. no earlier commit of this round touched it;
+    conflicting candidates are dropped and retried in a later round
+
+    Args:
+        V (int):        number of nodes in graph
+        snap (ndarray): copy of MATE taken before this round
+    Returns:
+        int: the number of augmentations applied
+    """
+    committed = 0
+    for i in range(success.shape[0]):
+        if success[i] == 0:
+            continue
+        ok = True
+        for v in range(1, V + 1):
+            if candMate[i, v] != snap[v] and MATE[v] != snap[v]:
+                ok = False
+                break
+        if ok:
+            for v in range(1, V + 1):
+                if candMate[i, v] != snap[v]:
+                    MATE[v] = candMate[i, v]
+            committed += 1
+    return committed
+
+
+try:
+    # built by compile_mm.py; the AOT module gives the first E() call
+    # native speed with no JIT warmup
+    from mm_kernel import e_search as _e_search
+except ImportError:
+    try:
+        # built by 'python setup.py build_ext --inplace'; the Cython kernel
+        # is the same search compiled without any numba runtime
+        from MaxMatching_c import e_search as _e_search
+    except ImportError:
+        _e_search = _E
 
 
 class MaxMatching(object):
     def __init__(self, V):
         """
         Initialize the MaxMatching object with member variables like LABEL,
-        MATE, FIRST, END, adjacency list graph, outerEdges, outerVertices
+        MATE, FIRST, END and the CSR adjacency arrays
 
         Args:
             V (int): number of nodes in graph
@@ -17,31 +398,31 @@ class MaxMatching(object):
         self.V = V
         VPlusOne = V+1
         self.VPlusOne = VPlusOne
-        self.END = list()
-        self.graph = [list() for _ in range(VPlusOne)]
-
-        # outerEdges is a list of 2-tuple which is (v, n_vw)
-        # The 3 member variables below are chosen to run E2:
-        #   "A possible choice method is "breadth-first": an outer vertex
-        #    x = x1 is chosen, and edges x1y are chosen in succeeding
-        #    executions of E2, when all such edges have been chosen, the
-        #    vertex x2 that was labeled immediately after x1 is chosen, and
-        #    the process is repeated for x = x2. This breadth-first method
-        #    requires that Algorithm E maintain a list of outer vertices,
-        #    x1, x2, ..."
-        self.outerEdges = list()
-        self.outerVertices = set()
-        self.outerIdx = 0
+
+        # edges are collected here by addEdge/addEdges and converted to CSR
+        # arrays (indptr, indices) plus the END array by finalize().
+        # Individually added endpoints are staged in an array of raw C ints
+        # rather than a list of tuples of boxed Python ints
+        self.edges = array('i')
+        self.edgeArrays = list()
+        self.END = np.empty(0, dtype=np.int32)
+        self.indptr = np.zeros(VPlusOne + 1, dtype=np.int32)
+        self.indices_n = np.empty(0, dtype=np.int32)
+        self.indices_w = np.empty(0, dtype=np.int32)
+        self.oe_v = np.empty(0, dtype=np.int32)
+        self.oe_n = np.empty(0, dtype=np.int32)
+        self.oe_w = np.empty(0, dtype=np.int32)
+        self.finalized = False
 
         # E0 init
-        self.LABEL = [-1] * VPlusOne
-        self.MATE = [0] * VPlusOne
-        self.FIRST = [0] * VPlusOne
+        self.LABEL = np.full(VPlusOne, -1, dtype=np.int32)
+        self.MATE = np.zeros(VPlusOne, dtype=np.int32)
+        self.FIRST = np.zeros(VPlusOne, dtype=np.int32)
 
     def addEdge(self, v, w):
         """
-        Adds vertices to END array and updates adjacency list with the
-        corresponding edge number n(vw)
+        Records the edge vw. The edge gets the number n(vw) determined by
+        insertion order; the CSR arrays are (re)built by finalize()
 
         Args:
             v (int): vertex v in [1, V]
@@ -49,123 +430,105 @@ class MaxMatching(object):
         Returns:
             None
         """
-        n_vw = len(self.END) + self.VPlusOne
-        self.END.append(v)
-        self.END.append(w)
+        self.edges.append(v)
+        self.edges.append(w)
+        self.finalized = False
 
-        self.graph[v].append(n_vw)
-        self.graph[w].append(n_vw)
-
-    def getEdge(self, n_vw):
+    def addEdges(self, pairs):
         """
-        Gets the tuple corresponding to edge number n(vw)
+        Records a whole batch of edges at once. The edges get numbers n(vw)
+        determined by insertion order, after any individually added edges;
+        the CSR arrays are (re)built by finalize()
 
         Args:
-            n_vw (int): the number of edge vw
+            pairs (ndarray): an (N, 2) array of vertex pairs in [1, V]
         Returns:
-            (int,int): a tuple of vertices (v,w)
-        """
-        n_vw -= self.VPlusOne
-        return (self.END[n_vw], self.END[n_vw+1])
-
-    def getMatchingSize(self):
-        """
-        Gets the size of current matching i.e. |M|. After algorithm E has run,
-        the return value will correspond to maximum matching of graph
-        Args:
             None
-        Returns:
-            int: size of current matching
         """
-        return sum(map(lambda x: 1 if x > 0 else 0, self.MATE[1:]))
+        self.edgeArrays.append(np.asarray(pairs, dtype=np.int32).reshape(-1, 2))
+        self.finalized = False
 
-    def setLabel(self, v, label):
+    def finalize(self):
         """
-        Updates the LABEL array for the object and updates outerVertices and
-        outerEdges if the new label is an outer label
+        Converts the recorded edges to the CSR adjacency arrays: for the
+        slots k in [indptr[v], indptr[v+1]), indices_n[k] holds the edge
+        number n(vw) and indices_w[k] the neighbor w, so traversal needs no
+        lookup through END. Also builds the END array so getEdge is a pair
+        of ndarray loads
 
         Args:
-            v (int):        a vertex in [1, V]
-            label (int):    a label in {-n_vw, -1, 1..V+2W}
+            None
         Returns:
             None
         """
-        self.LABEL[v] = label
-
-        if label >= 0 and v not in self.outerVertices:
-            self.outerVertices.add(v)
-            self.outerEdges.extend([(v, e) for e in self.graph[v]])
-
-    def hasVertexLabel(self, v):
-        """
-        Check whether the vertex has a vertex label
-
-        Args:
-            v (int): vertex in [1, V]
-        Return:
-            bool: True if v has vertex label, False otherwise
-        """
-        return self.LABEL[v] >= 1 and self.LABEL[v] <= self.V
-
-    def hasEdgeLabel(self, v):
-        """
-        Check whether the vertex has an edge label
-
-        Args:
-            v (int): vertex in [1, V]
-        Return:
-            bool: True if v has edge label, False otherwise
-        """
-        WTimesTwo = len(self.END)
-        return self.LABEL[v] > self.V and self.LABEL <= self.V + WTimesTwo
+        if self.finalized:
+            return
 
-    def hasStartLabel(self, v):
-        """
-        Check whether the vertex has a start label
+        VPlusOne = self.VPlusOne
+        parts = list(self.edgeArrays)
+        if len(self.edges) > 0:
+            # np.array copies the staged ints; a frombuffer view would keep
+            # the array.array buffer exported and make later addEdge calls
+            # fail to resize it
+            parts.insert(0, np.array(self.edges,
+                                     dtype=np.int32).reshape(-1, 2))
+        if len(parts) == 0:
+            allEdges = np.empty((0, 2), dtype=np.int32)
+        elif len(parts) == 1:
+            allEdges = parts[0]
+        else:
+            allEdges = np.concatenate(parts)
+        numEdges = allEdges.shape[0]
+
+        # END is just the flattened pair list; entry 2i holds v, 2i+1
+        # holds w for the edge numbered 2i + VPlusOne
+        END = np.ascontiguousarray(allEdges).reshape(-1)
+        self.END = END
+
+        # count degrees, cumsum into indptr, then scatter edge numbers:
+        # a stable argsort of the flattened endpoints groups the slots by
+        # vertex while keeping the per-vertex insertion order
+        deg = np.bincount(END, minlength=VPlusOne)
+        indptr = np.zeros(VPlusOne + 1, dtype=np.int32)
+        np.cumsum(deg, out=indptr[1:])
+        self.indptr = indptr
+        nums = VPlusOne + 2 * (np.arange(2 * numEdges) // 2)
+        order = np.argsort(END, kind='stable')
+        self.indices_n = nums[order].astype(np.int32)
+        # slot k of the flattened pair list belongs to edge k // 2 and the
+        # other endpoint sits in the partner slot k ^ 1
+        self.indices_w = END[order ^ 1]
+
+        # outer-edge queue scratch for the _E kernel: every vertex enqueues
+        # its incident (v, n_vw) pairs at most once per search, so 2W is an
+        # upper bound on the queue length
+        self.oe_v = np.empty(2 * numEdges, dtype=np.int32)
+        self.oe_n = np.empty(2 * numEdges, dtype=np.int32)
+        self.oe_w = np.empty(2 * numEdges, dtype=np.int32)
+        self.finalized = True
 
-        Args:
-            v (int): vertex in [1, V]
-        Return:
-            bool: True if v has start label, False otherwise
-        """
-        return self.LABEL[v] == 0
-
-    def chooseAnEdge(self):
+    def getEdge(self, n_vw):
         """
-        Choose an outer edge xy where x is outer using the "breadth-first"
-        method suggested by the paper
+        Gets the tuple corresponding to edge number n(vw)
 
         Args:
-            None:
+            n_vw (int): the number of edge vw
         Returns:
-            (int,int):  a tuple of x, n_xy where x in [1, V] and n_xy in
-                        [V+1, V+2W] or None,None
-        """
-        # E2
-        if len(self.outerEdges) > self.outerIdx:
-            x_nxy = self.outerEdges[self.outerIdx]
-            self.outerIdx += 1
-            return x_nxy
-        return None, None
-
-    def stopTheSearch(self):
+            (int,int): a tuple of vertices (v,w)
         """
-        Performs the step E7 in the algorithm that makes all vertices nonouter
-        for the next search
+        n_vw -= self.VPlusOne
+        return (self.END[n_vw], self.END[n_vw+1])
 
+    def getMatchingSize(self):
+        """
+        Gets the size of current matching i.e. |M|. After algorithm E has run,
+        the return value will correspond to maximum matching of graph
         Args:
             None
         Returns:
-            None
+            int: size of current matching
         """
-        # E7
-        self.LABEL[0] = -1
-        for v in self.outerVertices:
-            self.setLabel(v, -1)
-            self.setLabel(self.MATE[v], -1)
-        self.outerVertices.clear()
-        self.outerEdges.clear()
-        self.outerIdx = 0
+        return int(np.count_nonzero(self.MATE[1:] > 0))
 
     def isMatched(self, v):
         """
@@ -178,175 +541,37 @@ class MaxMatching(object):
         """
         return self.MATE[v] > 0
 
-    def isOuterVertex(self, v):
-        """
-        Check if a vertex v is labelled as an outer vertex by the algorithm yet
-
-        Args:
-            v (int): vertex in [1, V]
-        Returns:
-            bool: True if the vertex is labelled outer, False otherwise
-        """
-        return v in self.outerVertices
-
-    def setFlag(self, v, n_xy):
-        """
-        Flags vertex v with edge number n_xy
-
-        Args:
-        Args:
-            v (int):    vertex in [1, V]
-            n_xy (int): edge number for edge xy
-        Returns:
-            None
-        """
-        self.setLabel(v, -n_xy)
-
-    def isFlagged(self, v, n_xy):
-        """
-        Check if a vertex v is flagged with an edge by L
-
-        Args:
-            v (int):    vertex in [1, V]
-            n_xy (int): edge number for edge xy
-        Returns:
-            bool: True if the vertex is flagged with edge, False otherwise
-        """
-        return self.LABEL[v] == -n_xy
-
-    def L(self, x, y, n_xy):
-        """
-        L assigns the edge label n(xy) to nonouter vertices. Edge xy joins
-        outer vertices x,y. L sets join to the first nonouter vertex n both
-        P(x) and P(y). Then it labels all nonouter vertices preceding join in
-        P(x) or P(y)
-
-        Args:
-            x (int): vertex x in [1, V]
-            y (int): vertex y in [1, V]
-        Returns:
-            None
-        """
-        r, s = self.FIRST[x], self.FIRST[y]
-        if r == s:
-            return
-
-        # steps L1-L2 find join by advancing alternately along paths P(x) and
-        # P(y). Flags are assigned to nonouter vertices r in these paths. This
-        # is done by setting LABEL(r) to a negative edge number,
-        #       LABEL(r) <- -n(xy).
-        # This way, each invocation of L uses a distinct flag value
-
-        self.setFlag(r, n_xy)
-
-        # L1: switch paths
-        while True:
-            if s != 0:
-                # r is flagged nonouter vertex, alternately in P(x) and P(y)
-                r, s = s, r
-
-            # L2: next nonouter vertex
-            # r is set to the next nonouter vertex in P(x) or P(y)
-            r = self.FIRST[self.LABEL[self.MATE[r]]]
-            if self.isFlagged(r, n_xy):
-                join = r
-                break
-            self.setFlag(r, n_xy)
-            # go to L1
-
-        # L3: label vertices in P(x), P(y)
-        for v in (self.FIRST[x], self.FIRST[y]):
-            # L4: label v
-            while v != join:
-                self.setLabel(v, n_xy)
-                self.FIRST[v] = join
-                v = self.FIRST[self.LABEL[self.MATE[v]]]
-        # L5: update FIRST
-        for i in self.outerVertices:
-            if self.isOuterVertex(self.FIRST[i]):
-                self.FIRST[i] = join
-
-    def R(self, v, w):
+    def E(self, parallel=False):
         """
-        R(v,w) rematches edges in the augmenting path. Vertex v is outer.
-        Part of path (w)*P(v) is in the augmenting path. It gets rematched
-        by R(v, w) (Although R sets MATE(v) <- w, it does not set
-        MATE(w) <- v. This is done in step E3 or another call to R)
+        E constructs a maximum mathching on a graph. The search itself runs
+        in the compiled _E kernel; this wrapper only makes sure the CSR
+        arrays are built and hands the ndarray fields over
 
-        Args:
-            v (int): vertex in [1, V]
-            w (int): vertex in [1, V]
-        Returns:
-            None
-        """
-        # R1: Match v to w
-        t = self.MATE[v]
-        self.MATE[v] = w
-        if self.MATE[t] != v:
-            # the path is completely rematched
-            return
-
-        # R2: Rematch a path
-        if self.hasVertexLabel(v):
-            self.MATE[t] = self.LABEL[v]
-            self.R(self.LABEL[v], t)
-            return
-
-        # R3: Rematch two paths
-        x, y = self.getEdge(self.LABEL[v])
-        self.R(x, y)
-        self.R(y, x)
-
-    def E(self):
-        """
-        E constructs a maximum mathching on a graph. It starts a search for an
-        augmenting path to each unmatched vertex u. It scans edges of the
-        graph, deciding to assign new labels or to augment the matching
+        With parallel=True, rounds of concurrent searches are run first:
+        every unmatched root searches a private copy of MATE and the
+        non-conflicting augmentations are committed serially, repeating
+        while progress is made. The sequential kernel then finishes the
+        residual, so the result is always a maximum matching
 
         Args:
-            None
+            parallel (bool): search from the unmatched roots concurrently
         Returns:
             None
         """
-
-        # TODO: this can be a for-loop + tqdm
-        for u in range(1, self.V + 1):
-            # E1: Find an unmatched vertex
-            if self.MATE[u] > 0:
-                continue
-            self.setLabel(u, 0)
-            self.FIRST[u] = 0
-
-            # E2: Choose an edge
+        self.finalize()
+        if parallel:
             while True:
-                x, n_xy = self.chooseAnEdge()
-                if x is None:
-                    # E7
-                    self.stopTheSearch()
+                roots = np.nonzero(self.MATE[1:] == 0)[0].astype(np.int32)
+                roots += 1
+                if roots.shape[0] < 2:
                     break
-                edge = self.getEdge(n_xy)
-                y = x ^ edge[0] ^ edge[1]
-
-                # E3: augment the matching
-                if not self.isMatched(y) and y != u:
-                    self.MATE[y] = x
-                    # R completes augmenting path along path (y)*P(x)
-                    self.R(x, y)
-                    # E7: stop the search
-                    self.stopTheSearch()
+                snap = self.MATE.copy()
+                success, candMate = _parallelPhase(
+                    self.V, self.indptr, self.indices_n, self.indices_w,
+                    self.END, self.MATE, roots)
+                if _commitPhase(self.V, self.MATE, snap, success,
+                                candMate) == 0:
                     break
-
-                # E4: assign edge labels
-                if self.isOuterVertex(y):
-                    # L assigns edge label n(xy) to nonouter vertices in
-                    #  P(x) and P(y)
-                    self.L(x, y, n_xy)
-                    continue
-
-                # E5: Assign a  vertex label
-                v = self.MATE[y]
-                if not self.isOuterVertex(v):
-                    self.setLabel(v, x)
-                    self.FIRST[v] = y
-
-                # E6: get next edge (continue looping)
+        _e_search(self.V, self.indptr, self.indices_n, self.indices_w,
+                  self.END, self.LABEL, self.MATE, self.FIRST,
+                  self.oe_v, self.oe_n, self.oe_w)
@@ -0,0 +1,223 @@
+# cython: boundscheck=False, initializedcheck=False, cdivision=True
+# cython: language_level=3
+"""
+Cython build of the search kernels in MaxMatching.py. The module exposes
+e_search with the same signature as the @njit _E kernel, so MaxMatching can
+dispatch to whichever compiled version is available. Build it with:
+    python setup.py build_ext --inplace
+"""
+import numpy as np
+
+
+ctypedef struct Cursors:
+    long outer_n
+    long oe_tail
+
+
+cdef inline Cursors _set_label(long v, long label, long phase,
+                               int[:] indptr, int[:] indices_n,
+                               int[:] indices_w, int[:] LABEL,
+                               int[:] phase_of, int[:] outer_pha,
+                               int[:] outer_list, Cursors cur,
+                               int[:] oe_v, int[:] oe_n, int[:] oe_w):
+    # see _setLabel in MaxMatching.py
+    cdef long k
+    LABEL[v] = label
+    phase_of[v] = phase
+
+    if label >= 0 and outer_pha[v] != phase:
+        outer_pha[v] = phase
+        outer_list[cur.outer_n] = v
+        cur.outer_n += 1
+        for k in range(indptr[v], indptr[v+1]):
+            oe_v[cur.oe_tail] = v
+            oe_n[cur.oe_tail] = indices_n[k]
+            oe_w[cur.oe_tail] = indices_w[k]
+            cur.oe_tail += 1
+    return cur
+
+
+cdef inline Cursors _do_L(long x, long y, long n_xy, long phase, long V,
+                          int[:] indptr, int[:] indices_n, int[:] indices_w,
+                          int[:] LABEL, int[:] phase_of, int[:] MATE,
+                          int[:] FIRST, int[:] outer_pha, int[:] outer_list,
+                          Cursors cur, int[:] oe_v, int[:] oe_n,
+                          int[:] oe_w):
+    # see _L in MaxMatching.py
+    cdef long r, s, t, m, join, v, k, i
+
+    r, s = FIRST[x], FIRST[y]
+    if r == s:
+        return cur
+
+    cur = _set_label(r, -n_xy, phase, indptr, indices_n, indices_w, LABEL,
+                     phase_of, outer_pha, outer_list, cur, oe_v, oe_n, oe_w)
+    cur = _set_label(s, -n_xy, phase, indptr, indices_n, indices_w, LABEL,
+                     phase_of, outer_pha, outer_list, cur, oe_v, oe_n, oe_w)
+
+    # L1: switch paths (branchless interchange, see MaxMatching.py)
+    while True:
+        m = -(s != 0)
+        t = (r ^ s) & m
+        r = r ^ t
+        s = s ^ t
+
+        # L2: next nonouter vertex
+        r = FIRST[LABEL[MATE[r]]]
+        if phase_of[r] == phase and LABEL[r] == -n_xy:
+            join = r
+            break
+        cur = _set_label(r, -n_xy, phase, indptr, indices_n, indices_w,
+                         LABEL, phase_of, outer_pha, outer_list, cur,
+                         oe_v, oe_n, oe_w)
+
+    # L3-L4: label vertices in P(x), P(y)
+    for i in range(2):
+        v = FIRST[x] if i == 0 else FIRST[y]
+        while v != join:
+            cur = _set_label(v, n_xy, phase, indptr, indices_n, indices_w,
+                             LABEL, phase_of, outer_pha, outer_list, cur,
+                             oe_v, oe_n, oe_w)
+            FIRST[v] = join
+            v = FIRST[LABEL[MATE[v]]]
+
+    # L5: update FIRST
+    for k in range(cur.outer_n):
+        i = outer_list[k]
+        if outer_pha[FIRST[i]] == phase:
+            FIRST[i] = join
+    return cur
+
+
+cdef void _do_R(long v, long w, long V, int[:] END, int[:] LABEL,
+                int[:] MATE, int[:] stack_v, int[:] stack_w):
+    # see _R in MaxMatching.py
+    cdef long sp, t, lab, n, x, y
+
+    stack_v[0] = v
+    stack_w[0] = w
+    sp = 1
+
+    while sp > 0:
+        sp -= 1
+        v, w = stack_v[sp], stack_w[sp]
+
+        # R1: Match v to w
+        t = MATE[v]
+        MATE[v] = w
+        if MATE[t] != v:
+            continue
+
+        # R2: Rematch a path
+        lab = LABEL[v]
+        if lab >= 1 and lab <= V:
+            MATE[t] = lab
+            stack_v[sp] = lab
+            stack_w[sp] = t
+            sp += 1
+            continue
+
+        # R3: Rematch two paths
+        n = lab - (V + 1)
+        x, y = END[n], END[n+1]
+        stack_v[sp] = y
+        stack_w[sp] = x
+        sp += 1
+        stack_v[sp] = x
+        stack_w[sp] = y
+        sp += 1
+
+
+cdef bint _search_root(long u, long phase, long V, int[:] indptr,
+                       int[:] indices_n, int[:] indices_w, int[:] END,
+                       int[:] LABEL, int[:] phase_of, int[:] MATE,
+                       int[:] FIRST, int[:] outer_pha, int[:] outer_list,
+                       int[:] oe_v, int[:] oe_n, int[:] oe_w,
+                       int[:] stack_v, int[:] stack_w):
+    # see _searchRoot in MaxMatching.py
+    cdef Cursors cur
+    cdef long oe_head, x, y, n_xy, v
+
+    cur.outer_n = 0
+    cur.oe_tail = 0
+    oe_head = 0
+    cur = _set_label(u, 0, phase, indptr, indices_n, indices_w, LABEL,
+                     phase_of, outer_pha, outer_list, cur, oe_v, oe_n, oe_w)
+    FIRST[u] = 0
+
+    # E2: Choose an edge
+    while True:
+        if oe_head >= cur.oe_tail:
+            return False
+        x, n_xy = oe_v[oe_head], oe_n[oe_head]
+        y = oe_w[oe_head]
+        oe_head += 1
+
+        # E3: augment the matching
+        if MATE[y] == 0 and y != u:
+            MATE[y] = x
+            _do_R(x, y, V, END, LABEL, MATE, stack_v, stack_w)
+            return True
+
+        # E4: assign edge labels
+        if outer_pha[y] == phase:
+            if FIRST[x] == FIRST[y]:
+                # x and y already lie in the same blossom, so L has
+                # nothing to label; prune the call here
+                continue
+            cur = _do_L(x, y, n_xy, phase, V, indptr, indices_n, indices_w,
+                        LABEL, phase_of, MATE, FIRST, outer_pha, outer_list,
+                        cur, oe_v, oe_n, oe_w)
+            continue
+
+        # E5: Assign a vertex label
+        v = MATE[y]
+        if outer_pha[v] != phase:
+            cur = _set_label(v, x, phase, indptr, indices_n, indices_w,
+                             LABEL, phase_of, outer_pha, outer_list, cur,
+                             oe_v, oe_n, oe_w)
+            FIRST[v] = y
+
+        # E6: get next edge (continue looping)
+
+
+def e_search(long V, int[:] indptr, int[:] indices_n, int[:] indices_w,
+             int[:] END, int[:] LABEL, int[:] MATE, int[:] FIRST,
+             int[:] oe_v, int[:] oe_n, int[:] oe_w):
+    """
+    E constructs a maximum matching on a graph; same contract as the
+    @njit _E kernel in MaxMatching.py
+
+    Args:
+        V (int): number of nodes in graph
+    Returns:
+        None
+    """
+    cdef long phase, matched, u
+    cdef int[:] phase_of, outer_pha, outer_list, stack_v, stack_w
+
+    phase = 1
+    phase_of = np.zeros(V + 1, dtype=np.int32)
+    outer_pha = np.zeros(V + 1, dtype=np.int32)
+    outer_list = np.empty(V + 1, dtype=np.int32)
+    stack_v = np.empty(2 * (V + 1), dtype=np.int32)
+    stack_w = np.empty(2 * (V + 1), dtype=np.int32)
+
+    matched = 0
+    for u in range(1, V + 1):
+        if MATE[u] > 0:
+            matched += 1
+
+    for u in range(1, V + 1):
+        if matched >= V - 1:
+            # the matching is maximum, remaining searches are no-ops
+            return
+        # E1: Find an unmatched vertex
+        if MATE[u] > 0:
+            continue
+        if _search_root(u, phase, V, indptr, indices_n, indices_w, END,
+                        LABEL, phase_of, MATE, FIRST, outer_pha, outer_list,
+                        oe_v, oe_n, oe_w, stack_v, stack_w):
+            matched += 2
+        # E7: bumping the phase outdates every label and outer mark
+        phase += 1
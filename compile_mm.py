@@ -0,0 +1,23 @@
+"""
+Ahead-of-time compiles the _E search kernel into a native extension module
+named mm_kernel with numba.pycc, so that processes using MaxMatching pay no
+JIT warmup on the first E() call. MaxMatching imports mm_kernel if it has
+been built and falls back to the @njit kernels otherwise.
+
+Build it with:
+    python compile_mm.py
+"""
+from numba.pycc import CC
+
+from MaxMatching import _E
+
+cc = CC('mm_kernel')
+cc.export(
+    'e_search',
+    'void(i8, i4[:], i4[:], i4[:], i4[:], i4[:], i4[:], i4[:], i4[:], '
+    'i4[:], i4[:])'
+)(_E.py_func)
+
+
+if __name__ == '__main__':
+    cc.compile()
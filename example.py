@@ -1,14 +1,54 @@
+import numpy as np
+from numba import njit, prange
+
 from MaxMatching import MaxMatching
 
 
+@njit(parallel=True, cache=True)
+def buildEdges(b):
+    """
+    Builds the (N, 2) array of 1-based vertex pairs whose banana sums are
+    not powers of two. Runs the O(V^2) pair loop in two compiled passes,
+    both parallel over i: one to count the edges per row, one to fill the
+    output after a serial prefix sum over the counts
+
+    Args:
+        b (ndarray): the banana counts as an int64 array
+    Returns:
+        ndarray: the valid pairs, ordered by (i, j)
+    """
+    n = b.shape[0]
+    counts = np.zeros(n, dtype=np.int64)
+    for i in prange(n):
+        c = 0
+        for j in range(i + 1, n):
+            s = b[i] + b[j]
+            if s & (s - 1) != 0:
+                c += 1
+        counts[i] = c
+
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    for i in range(n):
+        offsets[i + 1] = offsets[i] + counts[i]
+
+    out = np.empty((offsets[n], 2), dtype=np.int32)
+    for i in prange(n):
+        k = offsets[i]
+        for j in range(i + 1, n):
+            s = b[i] + b[j]
+            if s & (s - 1) != 0:
+                out[k, 0] = i + 1
+                out[k, 1] = j + 1
+                k += 1
+    return out
+
+
 def solution(bananas):
     nodes = len(bananas)
-    maxMatching = MaxMatching(nodes)
-    for i in range(nodes):
-        for j in range(i+1, nodes):
-            if valid(bananas[i], bananas[j]):
-                maxMatching.addEdge(i+1, j+1)
+    b = np.asarray(bananas, dtype=np.int64)
 
+    maxMatching = MaxMatching(nodes)
+    maxMatching.addEdges(buildEdges(b))
     maxMatching.E()
     return nodes - maxMatching.getMatchingSize()
 
@@ -0,0 +1,11 @@
+"""
+Builds the optional Cython extension with the compiled search kernel:
+    python setup.py build_ext --inplace
+"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name='GabowMaxMatching',
+    ext_modules=cythonize('MaxMatching_c.pyx'),
+)